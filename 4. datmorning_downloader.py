@@ -1,103 +1,269 @@
-"""
-IMPORTANT USAGE NOTES:
-
-1. Before running this script, you must manually open Chrome with debugging enabled:
-   - Open a command prompt and run:
-
-     "C:\Program Files\Google\Chrome\Application\chrome.exe" --remote-debugging-port=9222 --user-data-dir="C:\ChromeDebug"
-
-   This will open a new Chrome profile with remote debugging enabled.
-
-2. In the newly opened Chrome:
-   - Go to: https://datanalysis.morningstar.com.au/af/login
-   - Log in with your Morningstar account.
-   - Navigate to the Search Tool / ASX Announcements PDF search.
-   - Perform the search to generate the list of PDF announcements.
-
-3. Once the PDF list is visible in Chrome, run this Python script.
-   - The script will connect to the Chrome instance via the debugger and download the PDFs.
-   - Make sure not to close the Chrome window while the script is running.
-"""
-
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import pandas as pd
-import os
-import time
-import random
-''''''
-options = Options()
-options.debugger_address = "127.0.0.1:9222"
-driver = webdriver.Chrome(options=options)
-
-# Create a folder "pdf_downloads" in the current directory if it doesn't exist
-default_download_path = os.path.join(os.getcwd(), "pdf_downloads")
-os.makedirs(default_download_path, exist_ok=True)
-
-print(driver.title)  # yes its working
-print(os)
-# Locate the tbody
-tbody = driver.find_element(By.XPATH, '//*[@id="search_results"]')
-
-# Get all <tr> rows under it
-rows = tbody.find_elements(By.TAG_NAME, "tr")
-
-# Group every 2 rows
-data = []
-for i in range(0, len(rows), 2):
-    try:
-        row1 = rows[i]
-        row2 = rows[i + 1]
-
-        # Example: extract all <td> text from each row
-        cols1 = [td.text.strip() for td in row1.find_elements(By.TAG_NAME, "td")]
-        cols2 = [td.text.strip() for td in row2.find_elements(By.TAG_NAME, "td")]
-
-        # Try to find the <a> tag in row2 (PDF link)
-        try:
-            link_element = row2.find_element(By.XPATH, ".//a[@href and contains(@href, '.pdf')]")
-            file_link = link_element.get_attribute("href")
-
-            # Extract filename from link
-            filename = file_link.split('/')[-1].split('#')[0]  # safely get the filename
-        except:
-            file_link = None
-            filename = None
-
-        if file_link and filename:
-            print(f"[INFO] Clicking to download: {filename}")
-            link_element.click()
-
-            # Wait for download to complete
-            file_path = os.path.join(default_download_path, filename)
-            max_wait = 30
-            waited = 0
-            while not os.path.exists(file_path) and waited < max_wait:
-                time.sleep(1)
-                waited += 1
-            if os.path.exists(file_path):
-                print(f"[✓] Downloaded {filename}")
-            else:
-                print(f"[ERROR] Download timed out: {filename}")
-
-            # Pause randomly
-            sleep_time = random.uniform(1, 3)
-            time.sleep(sleep_time)
-
-        combined = cols1 + cols2 + [file_link, filename]
-        data.append(combined)
-    except IndexError:
-        print(f"Skipping incomplete row pair at index {i}")
-
-# Print results
-for row in data:
-    print(row)
-
-num_data_columns = len(data[0]) - 2
-columns = [f'col{i+1}' for i in range(num_data_columns)] + ['file_link', 'filename']
-
-df = pd.DataFrame(data, columns=columns)
-df.to_csv("pfsdfsall.csv", index=False)
\ No newline at end of file
+"""
+IMPORTANT USAGE NOTES:
+
+1. Before running this script, you must manually open Chrome with debugging enabled:
+   - Open a command prompt and run:
+
+     "C:\Program Files\Google\Chrome\Application\chrome.exe" --remote-debugging-port=9222 --user-data-dir="C:\ChromeDebug"
+
+   This will open a new Chrome profile with remote debugging enabled.
+
+2. In the newly opened Chrome:
+   - Go to: https://datanalysis.morningstar.com.au/af/login
+   - Log in with your Morningstar account.
+   - Navigate to the Search Tool / ASX Announcements PDF search.
+   - Perform the search to generate the list of PDF announcements.
+
+3. Once the PDF list is visible in Chrome, run this Python script.
+   - The script will connect to the Chrome instance via the debugger and download the PDFs.
+   - Make sure not to close the Chrome window while the script is running.
+"""
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import WebDriverException
+import lxml.html
+from lxml.etree import XPath
+import asyncio
+import csv
+import requests
+import shutil
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+# aiohttp is preferred for the downloads; without it the script falls back
+# to a requests thread pool, which parallelizes the same I/O-bound work.
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Concurrent downloads in the thread-pool fallback (tune per link capacity)
+MAX_WORKERS = 10
+
+# Optional: direct URL of the search-results page. When set (env var), the
+# table is fetched with a plain authenticated GET and parsed with lxml —
+# no browser rendering or WebDriver round-trips in the scraping phase. The
+# browser is still needed once, for the login cookies.
+RESULTS_URL = os.environ.get("RESULTS_URL")
+
+# XPath evaluators compiled once; lxml re-parses a string expression on every
+# xpath() call otherwise
+_ROWS_XPATH = XPath('//*[@id="search_results"]//tr')
+_TDS_XPATH = XPath('./td')
+_PDF_LINK_XPATH = XPath(".//a[@href and contains(@href, '.pdf')]")
+
+
+def pdf_filename(href):
+    """Filename for a PDF link; urlsplit drops #fragments and ?query strings."""
+    if not href:
+        return None
+    return os.path.basename(urlsplit(href).path) or 'download.pdf'
+
+
+def extract_rows_lxml(page_source, base_url):
+    """Parse the results table from one page_source grab, no WebDriver calls."""
+    tree = lxml.html.fromstring(page_source)
+    tree.make_links_absolute(base_url)
+    rows = _ROWS_XPATH(tree)
+    records = []
+    for i in range(0, len(rows) - 1, 2):
+        cols1 = [td.text_content().strip() for td in _TDS_XPATH(rows[i])]
+        cols2 = [td.text_content().strip() for td in _TDS_XPATH(rows[i + 1])]
+        anchors = _PDF_LINK_XPATH(rows[i + 1])
+        href = anchors[0].get('href') if anchors else None
+        records.append({'cols1': cols1, 'cols2': cols2, 'href': href})
+    if len(rows) % 2:
+        print(f"Skipping incomplete row pair at index {len(rows) - 1}")
+    return records
+
+options = Options()
+options.debugger_address = "127.0.0.1:9222"
+driver = webdriver.Chrome(options=options)
+
+# Create a folder "pdf_downloads" in the current directory if it doesn't exist
+default_download_path = os.path.join(os.getcwd(), "pdf_downloads")
+os.makedirs(default_download_path, exist_ok=True)
+
+print(driver.title)  # yes its working
+
+# Session identity for the direct HTTP fetches: the browser's login cookies
+# and User-Agent, captured before any extraction path runs.
+cookies = {c['name']: c['value'] for c in driver.get_cookies()}
+user_agent = driver.execute_script("return navigator.userAgent")
+
+if RESULTS_URL:
+    # The table is reachable by plain GET: the browser is only needed for the
+    # login cookies, so skip rendering/WebDriver entirely and parse the HTML
+    # with the compiled lxml XPaths.
+    driver.quit()
+    page = requests.get(RESULTS_URL, cookies=cookies,
+                        headers={'User-Agent': user_agent}, timeout=60)
+    page.raise_for_status()
+    records = extract_rows_lxml(page.text, RESULTS_URL)
+else:
+    # Wait until the results table is present instead of assuming the search
+    # has rendered; the 100 ms poll reacts quickly without a fixed sleep.
+    WebDriverWait(driver, 30, poll_frequency=0.1).until(
+        EC.presence_of_element_located((By.ID, "search_results")))
+
+    # Extract the whole results table in one execute_script call. Walking it
+    # with per-row find_elements/get_attribute cost three WebDriver round-trips
+    # (JSON over HTTP to the browser) per record; doing the pairing and text
+    # extraction in-browser returns everything in a single call.
+    # Fall back to parsing page_source with the compiled lxml XPaths if script
+    # execution is blocked in the attached browser.
+    try:
+        result = driver.execute_script("""
+            const tbody = document.getElementById('search_results');
+            const rows = tbody.querySelectorAll('tr');
+            const out = [];
+            /* textContent is a plain DOM read; innerText forces a style/layout
+               pass per cell to compute rendered text */
+            const cellText = td => td.textContent.trim();
+            for (let i = 0; i + 1 < rows.length; i += 2) {
+                const cols1 = [...rows[i].querySelectorAll('td')].map(cellText);
+                const cols2 = [...rows[i + 1].querySelectorAll('td')].map(cellText);
+                const a = rows[i + 1].querySelector("a[href*='.pdf']");
+                out.push({cols1: cols1, cols2: cols2, href: a ? a.href : null});
+            }
+            return {records: out, rowCount: rows.length};
+        """)
+
+        records = result['records']
+        # A trailing unpaired row means the table didn't render in detail/link pairs
+        if result['rowCount'] % 2:
+            print(f"Skipping incomplete row pair at index {result['rowCount'] - 1}")
+    except WebDriverException as e:
+        print(f"[WARN] In-browser extraction failed ({e}); parsing page_source with lxml")
+        records = extract_rows_lxml(driver.page_source, driver.current_url)
+
+    # Everything needed from the browser is now snapshotted into plain Python
+    # data (rows, cookies, UA), so release the WebDriver session before the
+    # download phase; live element handles would go stale anyway if the page
+    # changed mid-download. The attached Chrome window itself stays open.
+    driver.quit()
+
+items = [(r['cols1'], r['cols2'], r['href'], pdf_filename(r['href'])) for r in records]
+
+# Download all PDFs concurrently. Clicking each link and polling the
+# filesystem once a second serialized the run behind every download; direct
+# GETs through one aiohttp session (carrying the browser's login cookies)
+# overlap the network waits, with the semaphore bounding in-flight requests.
+
+
+async def fetch(session, sem, file_link, filename):
+    file_path = os.path.join(default_download_path, filename)
+    # A completed file from a previous run is kept, making re-runs after an
+    # interruption nearly free; interrupted downloads only ever leave a
+    # .part file behind, so an existing final file is always whole
+    if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
+        print(f"[SKIP] Already downloaded: {filename}")
+        return
+    # Stream into a .part file and rename on success (like Chrome's
+    # .crdownload) so a mid-stream failure can't leave a truncated PDF
+    # under the final name for the skip check to trust
+    part_path = file_path + '.part'
+    async with sem:
+        try:
+            for attempt in range(5):
+                async with session.get(file_link) as response:
+                    # Back off exponentially when the server throttles; the
+                    # semaphore paces steady-state, this handles bursts
+                    if response.status == 429:
+                        await asyncio.sleep(2 ** attempt)
+                        continue
+                    response.raise_for_status()
+                    # Stream in 1 MiB chunks through a 1 MiB buffer instead of
+                    # holding the whole body; writes run off the event loop
+                    with open(part_path, 'wb', buffering=1 << 20) as f:
+                        async for chunk in response.content.iter_chunked(1 << 20):
+                            await asyncio.to_thread(f.write, chunk)
+                os.replace(part_path, file_path)
+                print(f"[✓] Downloaded {filename}")
+                return
+            print(f"[ERROR] Gave up on {filename} after repeated 429 responses")
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            print(f"[ERROR] Download failed for {filename}: {e}")
+            if os.path.exists(part_path):
+                os.remove(part_path)
+
+
+async def download_all(items):
+    sem = asyncio.Semaphore(5)
+    async with aiohttp.ClientSession(
+        cookies=cookies,
+        headers={'User-Agent': user_agent},
+        connector=aiohttp.TCPConnector(limit=10)
+    ) as session:
+        await asyncio.gather(*(fetch(session, sem, file_link, filename)
+                               for _, _, file_link, filename in items
+                               if file_link and filename))
+
+
+def download_one(session, file_link, filename):
+    file_path = os.path.join(default_download_path, filename)
+    if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
+        print(f"[SKIP] Already downloaded: {filename}")
+        return filename
+    # Same .part-then-rename dance as the async path, so failed streams
+    # never leave a truncated file under the final name
+    part_path = file_path + '.part'
+    try:
+        with session.get(file_link, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            with open(part_path, 'wb', buffering=1 << 20) as f:
+                shutil.copyfileobj(response.raw, f, length=1 << 20)
+        os.replace(part_path, file_path)
+    except (requests.RequestException, OSError):
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    return filename
+
+
+def download_all_threaded(items):
+    # Socket reads release the GIL, so threads overlap the network waits
+    # just like the asyncio path; the session is shared for connection reuse.
+    session = requests.Session()
+    session.cookies.update(cookies)
+    session.headers.update({'User-Agent': user_agent})
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(download_one, session, file_link, filename): filename
+            for _, _, file_link, filename in items
+            if file_link and filename
+        }
+        for future in as_completed(futures):
+            try:
+                print(f"[✓] Downloaded {future.result()}")
+            except (requests.RequestException, OSError) as e:
+                print(f"[ERROR] Download failed for {futures[future]}: {e}")
+
+
+if aiohttp is not None:
+    asyncio.run(download_all(items))
+else:
+    download_all_threaded(items)
+
+# Print results
+# Tuple unpacking builds each row in one allocation; the old
+# cols1 + cols2 + [...] chain made three intermediate lists per row
+data = [(*cols1, *cols2, file_link, filename)
+        for cols1, cols2, file_link, filename in items]
+for row in data:
+    print(row)
+
+num_data_columns = len(data[0]) - 2
+columns = [f'col{i+1}' for i in range(num_data_columns)] + ['file_link', 'filename']
+
+# Stream rows with csv.writer; building a DataFrame just to dump a flat
+# list of strings duplicated the table in memory (and cost the pandas import)
+with open("pfsdfsall.csv", 'w', newline='') as f:
+    writer = csv.writer(f)
+    writer.writerow(columns)
+    writer.writerows(data)
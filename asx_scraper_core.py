@@ -0,0 +1,644 @@
+"""
+ASX Scraper Core
+----------------
+Shared machinery for the main and fallback Yahoo Finance scrapers
+(`2. yfinance_webscraper.py` and `3. yfinance_webscraper(fallback).py`).
+
+The two scripts used to carry near-identical copies of the CSV download,
+the YahooFinanceScraper class and the orchestration loop, so every
+optimization had to be applied twice and both runs re-downloaded the
+same ~1 MB ASX company list. This module holds the single code path:
+
+- download_asx_csv()   → the ASX listed-companies CSV, disk-cached daily
+- get_asx_companies()  → cleaned company records with an optional filter
+- YahooFinanceScraper  → rate-limited, cached Yahoo Finance client
+- run()                → the full scrape/save pipeline, parametrized on
+                         the company filter and output file names
+"""
+
+import asyncio
+import aiohttp
+import requests
+import pandas as pd
+import time
+import random
+from typing import Callable, List, Dict, Optional
+import csv
+import io
+import json
+import re
+import os
+import sys
+import logging
+
+from cache import HtmlCache
+
+# orjson (C extension) serializes nested dicts several times faster than the
+# stdlib json module and emits bytes directly; fall back when not installed.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps_compact(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def _json_dumps_indented(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps_compact(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+    def _json_dumps_indented(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+ASX_CSV_URL = "https://www.asx.com.au/asx/research/ASXListedCompanies.csv"
+
+# Key metrics to extract from the statistics page
+KEY_METRICS = [
+    'Market Cap', 'Enterprise Value', 'Trailing P/E', 'Forward P/E',
+    'Price/Sales', 'Price/Book', 'Enterprise Value/Revenue',
+    'Enterprise Value/EBITDA', 'Beta', 'Return on Assets',
+    'Return on Equity', 'Revenue', 'Quarterly Revenue Growth',
+    'Gross Profit', 'EBITDA', 'Net Income', 'Diluted EPS',
+    'Total Cash', 'Total Debt', 'Book Value Per Share',
+    'Shares Outstanding', 'Float', 'Avg Vol (3 month)',
+    'Avg Vol (10 day)', '52 Week High', '52 Week Low',
+    'Dividend Yield', 'Payout Ratio', 'Profit Margin',
+    'Operating Margin', 'Quarterly Earnings Growth'
+]
+
+# One compiled alternation finds every metric in a single pass, instead of
+# building and running two fresh patterns per metric per page. The patterns
+# are bytes so the fallback scans response bytes without decoding ~500 KB of
+# HTML first. Longer names come first so e.g. 'Enterprise Value/Revenue' wins
+# over 'Revenue'. Tags between the name and its value (</td><td> etc.) are
+# skipped, and '<' is excluded from values so markup never leaks into them.
+_METRIC_RE = re.compile(
+    rb'(?P<metric>'
+    + '|'.join(re.escape(m) for m in sorted(KEY_METRICS, key=len, reverse=True)).encode()
+    + rb')\s*(?:<[^>]*>\s*)*[:\-]?\s*(?:<[^>]*>\s*)*([^<\n\r]{1,50})',
+    re.IGNORECASE)
+
+# Map case-insensitive matches back to the canonical metric names
+_METRIC_BY_LOWER = {m.lower(): m for m in KEY_METRICS}
+
+_SHARES_RE = re.compile(
+    rb'(?:Total Shares Outstanding|Shares Outstanding|Outstanding Shares)'
+    rb'\s*(?:<[^>]*>\s*)*[:\-]?\s*(?:<[^>]*>\s*)*([\d,\.]+[KMB]?)',
+    re.IGNORECASE)
+
+# Yahoo embeds the rendered page state as a JSON blob inside a <script> tag
+# (root.App.main). The bytes pattern finds it without decoding the page.
+_APP_MAIN_RE = re.compile(rb'root\.App\.main\s*=\s*(\{.*?\})\s*;\s*\n', re.S)
+
+# quoteSummary field -> statistics label, per module. Labels match the keys
+# the HTML table walk produces so the downstream CSV/JSON shape is unchanged.
+_QUOTE_FIELD_LABELS = {
+    'summaryDetail': {
+        'marketCap': 'Market Cap',
+        'trailingPE': 'Trailing P/E',
+        'forwardPE': 'Forward P/E',
+        'beta': 'Beta',
+        'priceToSalesTrailing12Months': 'Price/Sales',
+        'dividendYield': 'Dividend Yield',
+        'payoutRatio': 'Payout Ratio',
+        'fiftyTwoWeekHigh': '52 Week High',
+        'fiftyTwoWeekLow': '52 Week Low',
+        'averageVolume': 'Avg Vol (3 month)',
+        'averageVolume10days': 'Avg Vol (10 day)',
+    },
+    'defaultKeyStatistics': {
+        'enterpriseValue': 'Enterprise Value',
+        'priceToBook': 'Price/Book',
+        'enterpriseToRevenue': 'Enterprise Value/Revenue',
+        'enterpriseToEbitda': 'Enterprise Value/EBITDA',
+        'sharesOutstanding': 'Shares Outstanding',
+        'floatShares': 'Float',
+        'bookValue': 'Book Value Per Share',
+        'netIncomeToCommon': 'Net Income',
+        'trailingEps': 'Diluted EPS',
+    },
+    'financialData': {
+        'totalRevenue': 'Revenue',
+        'revenueGrowth': 'Quarterly Revenue Growth',
+        'grossProfits': 'Gross Profit',
+        'ebitda': 'EBITDA',
+        'totalCash': 'Total Cash',
+        'totalDebt': 'Total Debt',
+        'returnOnAssets': 'Return on Assets',
+        'returnOnEquity': 'Return on Equity',
+        'profitMargins': 'Profit Margin',
+        'operatingMargins': 'Operating Margin',
+        'earningsGrowth': 'Quarterly Earnings Growth',
+    },
+}
+
+
+def _extract_quote_summary_store(content: bytes):
+    """Pull the QuoteSummaryStore dict out of Yahoo's root.App.main blob."""
+    match = _APP_MAIN_RE.search(content)
+    if not match:
+        return None
+    try:
+        data = _json_loads(match.group(1))
+        return data['context']['dispatcher']['stores']['QuoteSummaryStore']
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _statistics_from_store(store: Dict) -> Dict:
+    """Map quoteSummary fields onto the statistics keys used downstream."""
+    statistics = {}
+    for module, fields in _QUOTE_FIELD_LABELS.items():
+        values = store.get(module) or {}
+        for field, label in fields.items():
+            value = values.get(field)
+            if isinstance(value, dict):
+                # Prefer the formatted value ('1.2B') to match the HTML shape
+                value = value.get('fmt', value.get('raw'))
+            if value is not None:
+                statistics.setdefault(label, str(value))
+    return statistics
+
+
+def download_asx_csv(cache_path: str = 'asx_listed_companies.csv',
+                     max_age: int = 86400) -> bytes:
+    """Return the ASX listed-companies CSV, re-downloading at most daily.
+
+    Every scraper needs the same ~1 MB file; caching it on disk with an
+    mtime check means the fallback run (or a same-day re-run) skips the
+    HTTP fetch entirely.
+    """
+    if os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < max_age:
+        logger.info(f"Using cached ASX company list ({cache_path})")
+        with open(cache_path, 'rb') as f:
+            return f.read()
+
+    logger.info("Fetching ASX company list...")
+    response = requests.get(ASX_CSV_URL, timeout=30)
+    response.raise_for_status()
+    with open(cache_path, 'wb') as f:
+        f.write(response.content)
+    return response.content
+
+
+def materials_filter(df: pd.DataFrame) -> pd.DataFrame:
+    """Keep only rows whose GICS industry group is Materials (vectorized)."""
+    return df[df['gics_industry_group'].str.lower().eq('materials')]
+
+
+def get_asx_companies(df_filter: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+                      label: str = 'matching') -> List[Dict]:
+    """
+    Load the ASX company list and return cleaned company records.
+    df_filter, when given, narrows the DataFrame (e.g. materials only)
+    before the records are built.
+    """
+    try:
+        content = download_asx_csv()
+
+        # Parse in memory: locate the header row in the first few lines, then
+        # read the CSV exactly once.
+        buf = io.BytesIO(content)
+        head = buf.read(4096).decode('utf-8', errors='replace').splitlines()
+        buf.seek(0)
+
+        header_row = None
+        for i, line in enumerate(head):
+            lowered = line.lower()
+            if 'company' in lowered and 'asx' in lowered and 'code' in lowered:
+                header_row = i
+                break
+
+        if header_row is None:
+            raise Exception("Could not locate CSV header row")
+
+        df = pd.read_csv(buf, header=header_row)
+
+        # Check if we have the expected columns (flexible matching)
+        columns = [col.strip() for col in df.columns]
+
+        # Look for company name column
+        company_col = None
+        for col in columns:
+            if 'company' in col.lower() and 'name' in col.lower():
+                company_col = col
+                break
+
+        # Look for ASX code column
+        code_col = None
+        for col in columns:
+            if 'asx' in col.lower() and 'code' in col.lower():
+                code_col = col
+                break
+
+        # Look for GICS industry column
+        gics_col = None
+        for col in columns:
+            if 'gics' in col.lower() and 'industry' in col.lower():
+                gics_col = col
+                break
+
+        if not (company_col and code_col and gics_col):
+            raise Exception("Could not parse CSV with any header configuration")
+
+        # Rename columns for consistency
+        df = df.rename(columns={
+            company_col: 'company_name',
+            code_col: 'asx_code',
+            gics_col: 'gics_industry_group'
+        })
+
+        # Clean up the dataframe
+        df = df.dropna(subset=['company_name', 'asx_code'])
+
+        # Vectorized cleaning: the string ops run in C over whole columns and
+        # to_dict('records') emits all rows in one call instead of iterrows
+        df['company_name'] = df['company_name'].astype(str).str.strip()
+        df['asx_code'] = df['asx_code'].astype(str).str.strip()
+        df['gics_industry_group'] = (
+            df['gics_industry_group'].fillna('Unknown').astype(str).str.strip())
+
+        total = len(df)
+        if df_filter is not None:
+            df = df_filter(df)
+
+        companies = (
+            df[['company_name', 'asx_code', 'gics_industry_group']]
+            .rename(columns={'company_name': 'name', 'asx_code': 'code'})
+            .to_dict('records'))
+
+        # Only a handful of distinct GICS groups exist across thousands of
+        # rows; intern them so every record shares one string object and
+        # equality checks reduce to a pointer compare
+        for company in companies:
+            company['gics_industry_group'] = sys.intern(company['gics_industry_group'])
+
+        logger.info(f"Found {len(companies)} {label} companies out of {total} total companies")
+
+        return companies
+
+    except Exception as e:
+        logger.error(f"Error fetching ASX companies: {e}")
+        logger.info(
+            "You can try downloading the CSV manually from: https://www.asx.com.au/markets/companies/listed-companies")
+        return []
+
+
+class YahooFinanceScraper:
+    def __init__(self, max_requests_per_minute=20):
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            # br needs the brotli package; ~20% smaller than gzip for HTML
+            'Accept-Encoding': 'gzip, deflate, br',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+        }
+        self.max_requests_per_minute = max_requests_per_minute
+        # Token bucket: refilled continuously at the per-minute budget, so the
+        # client can saturate the allowed rate without tracking request history.
+        # The ceiling (max_tokens) is adaptive: it starts conservatively, ramps
+        # up while the server answers 200 with stable latency, and halves on
+        # 429/503 so we track the server's real tolerance.
+        self.max_tokens = max(1.0, max_requests_per_minute / 2)
+        self.tokens = self.max_tokens
+        self.rate = max_requests_per_minute / 60.0
+        self.last_refill = time.monotonic()
+        self._successes = 0
+        self._avg_ttfb = None
+        self._rate_limit_lock = asyncio.Lock()
+        self.cache = HtmlCache()
+        # In-run memoization: duplicate codes in the CSV (or overlap between
+        # the main and fallback runs) should not trigger a second request for
+        # the same symbol.
+        self._symbol_cache: Dict[str, str] = {}
+        self._stats_cache: Dict[str, Dict] = {}
+
+    def get_yahoo_symbol(self, asx_code: str) -> str:
+        """Convert ASX code to Yahoo Finance symbol format."""
+        return self._symbol_cache.setdefault(asx_code, f"{asx_code}.AX")
+
+    async def _rate_limit_check(self):
+        """Implement rate limiting to be respectful to Yahoo Finance."""
+        async with self._rate_limit_lock:
+            now = time.monotonic()
+            self.tokens = min(self.max_tokens,
+                              self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+
+            # Out of tokens: wait just long enough for the next one to refill
+            if self.tokens < 1:
+                wait_time = (1 - self.tokens) / self.rate
+                logger.info(f"Rate limit reached. Waiting {wait_time:.1f} seconds...")
+                await asyncio.sleep(wait_time)
+                self.tokens = 1.0
+                self.last_refill = time.monotonic()
+
+            self.tokens -= 1
+
+        # Small jitter so concurrent requests don't fire in lockstep
+        await asyncio.sleep(random.uniform(0, 0.1))
+
+    def _record_response(self, status: int, ttfb: float, retry_after: str = None):
+        """Adapt the token-bucket ceiling to server feedback (hill climbing)."""
+        if status in (429, 503):
+            self.max_tokens = max(1.0, self.max_tokens / 2)
+            self._successes = 0
+            if retry_after:
+                try:
+                    delay = float(retry_after)
+                except ValueError:
+                    delay = 60.0
+                # Drain the bucket so the next refill waits out the server's ask
+                self.tokens = min(self.tokens, 1 - delay * self.rate)
+            logger.warning(
+                f"Server throttling (HTTP {status}); ceiling halved to {self.max_tokens:.0f} tokens")
+        elif status == 200:
+            if self._avg_ttfb is None:
+                self._avg_ttfb = ttfb
+            else:
+                self._avg_ttfb = 0.9 * self._avg_ttfb + 0.1 * ttfb
+
+            # Ramp up only while latency stays near the rolling baseline
+            if ttfb < self._avg_ttfb * 1.2:
+                self._successes += 1
+                if self._successes >= 5:
+                    self._successes = 0
+                    self.max_tokens = min(float(self.max_requests_per_minute),
+                                          self.max_tokens + 1)
+
+    # Transient statuses worth one or two retries with backoff
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    async def _get_bytes(self, session: aiohttp.ClientSession, url: str) -> bytes:
+        """GET a URL, retrying transient statuses with exponential backoff."""
+        for attempt in range(3):
+            await self._rate_limit_check()
+            start = time.monotonic()
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                self._record_response(response.status, time.monotonic() - start,
+                                      response.headers.get('Retry-After'))
+                if response.status in self.RETRY_STATUSES and attempt < 2:
+                    await asyncio.sleep(0.5 * (2 ** attempt))
+                    continue
+                response.raise_for_status()
+                return await response.read()
+
+    async def fetch_quote_summary(self, session: aiohttp.ClientSession, symbol: str):
+        """Fetch quoteSummary JSON for a symbol, cached like the HTML pages.
+
+        The JSON endpoint behind the statistics page is ~20-50 KB against
+        ~500 KB of HTML and needs no parsing fallbacks.
+        """
+        cache_key = f"qs:{symbol}"
+        payload = self.cache.get(cache_key, ttl=86400)
+        if payload is None:
+            url = (f"https://query1.finance.yahoo.com/v10/finance/quoteSummary/{symbol}"
+                   f"?modules=defaultKeyStatistics,financialData,summaryDetail")
+            payload = await self._get_bytes(session, url)
+            self.cache.put(cache_key, payload)
+
+        data = _json_loads(payload)
+        result = (data.get('quoteSummary') or {}).get('result') or []
+        return result[0] if result else None
+
+    async def scrape_statistics_page(self, session: aiohttp.ClientSession, symbol: str) -> Dict:
+        """Scrape Yahoo Finance statistics page for a given symbol."""
+        url = f"https://finance.yahoo.com/quote/{symbol}/key-statistics"
+
+        if symbol in self._stats_cache:
+            return self._stats_cache[symbol]
+
+        # Primary path: the quoteSummary JSON API. The HTML page below is
+        # only scraped when the API yields nothing.
+        try:
+            store = await self.fetch_quote_summary(session, symbol)
+            if store:
+                statistics = _statistics_from_store(store)
+                if statistics:
+                    self._stats_cache[symbol] = statistics
+                    return statistics
+        except Exception as e:
+            logger.warning(f"quoteSummary fetch failed for {symbol}: {e}")
+
+        try:
+            # Serve from the on-disk cache when a fresh copy exists; this skips
+            # the network round-trip and the rate limiter entirely.
+            content = self.cache.get(symbol, ttl=86400)
+            if content is not None:
+                logger.info(f"Cache hit for {symbol}")
+            else:
+                logger.info(f"Scraping statistics for {symbol}")
+                content = await self._get_bytes(session, url)
+                self.cache.put(symbol, content)
+
+            statistics = {}
+
+            # Yahoo renders the page client-side from a JSON blob embedded in
+            # a <script> tag; reading it directly yields typed values in one
+            # json.loads instead of a DOM walk plus regex passes.
+            store = _extract_quote_summary_store(content)
+            if store:
+                statistics = _statistics_from_store(store)
+
+            if not statistics:
+                # Fallback: parse the tables and regex-scan the page bytes.
+                # read_html parses with lxml in C and hands back whole columns,
+                # replacing the nested find_all('tr')/get_text loops.
+                try:
+                    tables = pd.read_html(io.BytesIO(content), flavor='lxml')
+                except ValueError:
+                    tables = []
+                for table in tables:
+                    if table.shape[1] < 2:
+                        continue
+                    pairs = table.iloc[:, :2].dropna()
+                    statistics.update(zip(pairs.iloc[:, 0].astype(str),
+                                          pairs.iloc[:, 1].astype(str)))
+
+                # Enhanced search for specific metrics, but only when the
+                # tables left gaps: in the common case every key metric is
+                # already present and the page-wide scan is skipped entirely.
+                missing = {m for m in KEY_METRICS if m not in statistics}
+                if missing:
+                    for match in _METRIC_RE.finditer(content):
+                        metric = _METRIC_BY_LOWER[match.group('metric').decode().lower()]
+                        if metric not in missing:
+                            continue
+                        value = match.group(2).decode('utf-8', errors='replace').strip()
+                        if value:
+                            statistics[metric] = value
+                            missing.discard(metric)
+                            if not missing:
+                                break
+
+                # Specific search for Shares Outstanding
+                if 'Shares Outstanding' not in statistics:
+                    match = _SHARES_RE.search(content)
+                    if match:
+                        statistics['Shares Outstanding'] = match.group(1).decode().strip()
+
+            self._stats_cache[symbol] = statistics
+            return statistics
+
+        except Exception as e:
+            logger.error(f"Error scraping statistics for {symbol}: {e}")
+            return {}
+
+    async def scrape_company_data(self, session: aiohttp.ClientSession, asx_code: str, company_name: str) -> Dict:
+        """Scrape statistics data for a company."""
+        symbol = self.get_yahoo_symbol(asx_code)
+
+        logger.info(f"Scraping data for {company_name} ({symbol})")
+
+        statistics = await self.scrape_statistics_page(session, symbol)
+
+        return {
+            'asx_code': asx_code,
+            'company_name': company_name,
+            'yahoo_symbol': symbol,
+            'statistics': statistics,
+            'scrape_timestamp': pd.Timestamp.now().isoformat()
+        }
+
+
+async def run(df_filter: Optional[Callable[[pd.DataFrame], pd.DataFrame]],
+              label: str,
+              progress_path: str,
+              out_prefix: str):
+    """Run the full scrape pipeline: load companies, scrape, save results."""
+    logger.info(f"Starting ASX {label} companies scraper")
+
+    # Step 1: Get the companies to scrape (filtered during the CSV load)
+    companies = get_asx_companies(df_filter, label=label)
+    if not companies:
+        logger.error(f"No {label} companies found")
+        return
+
+    # Print companies found
+    print(f"\n{label.capitalize()} companies to scrape:")
+    for company in companies:
+        print(f"- {company['name']} ({company['code']})")
+
+    # Step 2: Scrape Yahoo Finance data for all companies concurrently.
+    # One shared ClientSession reuses connections across the whole run; the
+    # semaphore bounds in-flight requests while _rate_limit_check enforces the
+    # per-minute budget.
+    scraper = YahooFinanceScraper()
+    scraped_data = []
+    semaphore = asyncio.Semaphore(8)
+
+    # Progress is append-only JSONL: one record per line as each company
+    # completes (O(1) per write instead of rewriting the whole list), and
+    # existing lines let an interrupted run resume where it left off.
+    done_codes = set()
+    if os.path.exists(progress_path):
+        with open(progress_path) as f:
+            for line in f:
+                try:
+                    record = _json_loads(line)
+                except ValueError:
+                    continue
+                scraped_data.append(record)
+                done_codes.add(record['asx_code'])
+        if done_codes:
+            logger.info(f"Resuming: {len(done_codes)} companies already in progress file")
+
+    # Context managers guarantee the connection pool and progress file are
+    # torn down exactly once, even if the gather raises; relying on GC (or a
+    # __del__) would leak sockets on interpreter shutdown.
+    with open(progress_path, 'ab') as progress_f:
+        async with aiohttp.ClientSession(
+            headers=scraper.headers,
+            connector=aiohttp.TCPConnector(limit=32, limit_per_host=32,
+                                           ttl_dns_cache=300, keepalive_timeout=60)
+        ) as session:
+
+            async def scrape_one(company):
+                async with semaphore:
+                    try:
+                        logger.info(f"Processing {company['name']}")
+
+                        company_data = await scraper.scrape_company_data(
+                            session,
+                            company['code'],
+                            company['name']
+                        )
+                        scraped_data.append(company_data)
+
+                        # Append progress after each company
+                        progress_f.write(_json_dumps_compact(company_data) + b'\n')
+
+                    except Exception as e:
+                        logger.error(f"Failed to scrape {company['name']}: {e}")
+
+            await asyncio.gather(*(scrape_one(company) for company in companies
+                                   if company['code'] not in done_codes))
+
+    scraper.cache.close()
+
+    # Step 3: Save final results
+    if scraped_data:
+        # Save as JSON
+        with open(f'{out_prefix}.json', 'wb') as f:
+            f.write(_json_dumps_indented(scraped_data))
+
+        # Save as CSV (flattened). Rows are streamed with DictWriter, so only
+        # one flat record exists at a time instead of a second full copy of
+        # the data plus a DataFrame.
+        stat_keys = []
+        seen = set()
+        for company in scraped_data:
+            for key in company['statistics']:
+                if key not in seen:
+                    seen.add(key)
+                    stat_keys.append(key)
+
+        fieldnames = (['asx_code', 'company_name', 'yahoo_symbol', 'scrape_timestamp']
+                      + [f'stats_{key}' for key in stat_keys])
+        with open(f'{out_prefix}.csv', 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            for company in scraped_data:
+                writer.writerow({
+                    'asx_code': company['asx_code'],
+                    'company_name': company['company_name'],
+                    'yahoo_symbol': company['yahoo_symbol'],
+                    'scrape_timestamp': company['scrape_timestamp'],
+                    **{f'stats_{key}': value
+                       for key, value in company['statistics'].items()},
+                })
+
+        logger.info(f"Successfully scraped data for {len(scraped_data)} companies")
+        logger.info(f"Data saved to '{out_prefix}.json' and '{out_prefix}.csv'")
+
+        # Print summary
+        print(f"\n📊 Scraping Summary:")
+        print(f"Total {label} companies found: {len(companies)}")
+        print(f"Successfully scraped: {len(scraped_data)}")
+        print(f"Success rate: {len(scraped_data) / len(companies) * 100:.1f}%")
+
+        # Print sample of captured data
+        if scraped_data:
+            print(f"\n📈 Sample data for {scraped_data[0]['company_name']}:")
+            stats = scraped_data[0]['statistics']
+            if 'Shares Outstanding' in stats:
+                print(f"  • Shares Outstanding: {stats['Shares Outstanding']}")
+            if 'Market Cap' in stats:
+                print(f"  • Market Cap: {stats['Market Cap']}")
+            if 'Revenue' in stats:
+                print(f"  • Revenue: {stats['Revenue']}")
+            print(f"  • Total metrics captured: {len(stats)}")
+
+    else:
+        logger.warning("No data was successfully scraped")
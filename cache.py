@@ -0,0 +1,51 @@
+"""
+Persistent HTML Response Cache
+------------------------------
+SQLite-backed cache for scraped Yahoo Finance pages, shared by the main
+and fallback scrapers.
+
+Each entry is keyed by symbol and stamped with a fetch time; lookups are
+served only while the entry is younger than the caller's TTL, so a fresh
+run re-fetches stale pages but interrupted runs resume for free.
+"""
+
+import os
+import sqlite3
+import time
+
+
+class HtmlCache:
+    """On-disk cache of raw page bytes keyed by symbol."""
+
+    def __init__(self, path: str = '.cache/yahoo.db'):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        # WAL so concurrent readers/writers don't block each other
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS pages '
+            '(symbol TEXT PRIMARY KEY, html BLOB, fetched_at INTEGER)'
+        )
+        self.conn.commit()
+
+    def get(self, symbol: str, ttl: int = 86400):
+        """Return cached page bytes for symbol, or None if absent/stale."""
+        row = self.conn.execute(
+            'SELECT html, fetched_at FROM pages WHERE symbol = ?', (symbol,)
+        ).fetchone()
+        if row and time.time() - row[1] < ttl:
+            return row[0]
+        return None
+
+    def put(self, symbol: str, html: bytes):
+        """Store page bytes for symbol, replacing any previous entry."""
+        self.conn.execute(
+            'INSERT OR REPLACE INTO pages (symbol, html, fetched_at) VALUES (?, ?, ?)',
+            (symbol, bytes(html), int(time.time()))
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()